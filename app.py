@@ -1,4 +1,5 @@
 import streamlit as st
+import asyncio
 import logging
 import os
 import dotenv
@@ -39,11 +40,16 @@ if API_KEYS_SET:
     st.sidebar.success("API keys loaded successfully from `.env`.")
     # Only import the generator if keys are set
     try:
-        from article_generator import ArticleGenerator
 
-        if "article_generator" not in st.session_state:
-            st.session_state.article_generator = ArticleGenerator()
-            logger.info("ArticleGenerator initialized and stored in session state.")
+        @st.cache_resource
+        def get_generator():
+            """Builds the process-wide ArticleGenerator shared by all sessions."""
+            from article_generator import ArticleGenerator
+
+            logger.info("Initializing process-wide ArticleGenerator.")
+            return ArticleGenerator()
+
+        generator = get_generator()
         generator_ready = True
     except Exception as e:
         st.error(f"Error initializing Article Generator: {e}")
@@ -59,41 +65,86 @@ else:
     )
     generator_ready = False
 
+# Bound concurrent generations to respect Serper/Firecrawl rate limits.
+MAX_CONCURRENT_GENERATIONS = 5
+
 # --- Main Area --- #
-keywords = st.text_input(
-    "Enter keywords for the article:",
-    placeholder="e.g., future of solar power, impact of AI on healthcare",
+keywords_text = st.text_area(
+    "Enter keywords for the article (one keyword set per line for a batch):",
+    placeholder="e.g.\nfuture of solar power\nimpact of AI on healthcare",
 )
+queries = [line.strip() for line in keywords_text.splitlines() if line.strip()]
 generate_button = st.button(
-    "Generate Article", disabled=not generator_ready or not keywords
+    "Generate Article(s)", disabled=not generator_ready or not queries
 )
 
-if "article_html" not in st.session_state:
-    st.session_state.article_html = ""
+if "articles" not in st.session_state:
+    st.session_state.articles = []
 
 if generate_button and generator_ready:
-    if keywords:
+    if len(queries) == 1:
+        keywords = queries[0]
+        logger.info("Generate button clicked. Keywords: '%s'", keywords)
+        st.caption("🔄 Generating article... The text appears as it is written.")
+        placeholder = st.empty()
+
+        async def stream_article() -> str:
+            """Streams the article into the placeholder and returns the full HTML."""
+            article_so_far = ""
+            async for article_so_far in generator.astream_generate(keywords):
+                placeholder.markdown(article_so_far, unsafe_allow_html=True)
+            # The last snapshot is the finalized (repaired and cached) article.
+            return article_so_far
+
+        try:
+            st.session_state.articles = [(keywords, asyncio.run(stream_article()))]
+            logger.info("Article generation complete.")
+        except Exception as e:
+            st.error(f"An error occurred: {e}")
+            logger.error(f"Error streaming article: {e}")
+            st.session_state.articles = [
+                (keywords, f"<p>Sorry, an error occurred during generation: {e}</p>")
+            ]
+        # The final article is rendered below; clear the streaming preview.
+        placeholder.empty()
+    elif queries:
+        logger.info("Generate button clicked. Batch of %d queries.", len(queries))
         with st.spinner(
-            "🔄 Generating article... This may take a minute or two. Please wait."
+            f"🔄 Generating {len(queries)} articles concurrently... Please wait."
         ):
-            logger.info(f"Generate button clicked. Keywords: '{keywords}'")
-            try:
-                # Use the generator stored in session state
-                st.session_state.article_html = (
-                    st.session_state.article_generator.generate(keywords)
+
+            async def generate_batch() -> list[str]:
+                """Generates all queried articles concurrently, with a bound."""
+                semaphore = asyncio.Semaphore(MAX_CONCURRENT_GENERATIONS)
+
+                async def generate_one(query: str) -> str:
+                    async with semaphore:
+                        return await generator.agenerate(query)
+
+                return await asyncio.gather(
+                    *[generate_one(query) for query in queries]
                 )
-                logger.info("Article generation complete.")
+
+            try:
+                results = asyncio.run(generate_batch())
+                st.session_state.articles = list(zip(queries, results))
+                logger.info("Batch article generation complete.")
             except Exception as e:
                 st.error(f"An error occurred: {e}")
-                logger.error(f"Error calling generator.generate(): {e}")
-                st.session_state.article_html = (
-                    f"<p>Sorry, an error occurred during generation: {e}</p>"
-                )
+                logger.error(f"Error generating article batch: {e}")
+                st.session_state.articles = []
     else:
         st.warning("Please enter some keywords.")
 
-# Display the generated article (or previous one)
-if st.session_state.article_html:
+# Display the generated articles (or previous ones)
+if st.session_state.articles:
     st.divider()
-    st.subheader("Generated Article")
-    st.markdown(st.session_state.article_html, unsafe_allow_html=True)
+    if len(st.session_state.articles) == 1:
+        st.subheader("Generated Article")
+        st.markdown(st.session_state.articles[0][1], unsafe_allow_html=True)
+    else:
+        st.subheader("Generated Articles")
+        tabs = st.tabs([query for query, _ in st.session_state.articles])
+        for tab, (query, article_html) in zip(tabs, st.session_state.articles):
+            with tab:
+                st.markdown(article_html, unsafe_allow_html=True)
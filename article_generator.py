@@ -1,21 +1,170 @@
 import os
+import asyncio
 import dotenv
+import hashlib
+import json
 import logging
+import re
 from datetime import datetime
+import numpy as np
+import openai
+from diskcache import Cache
 from llama_index.llms.openai import OpenAI
 from llama_index.core.agent import ReActAgent
+from llama_index.core.callbacks import CallbackManager, CBEventType, EventPayload
+from llama_index.core.callbacks.base_handler import BaseCallbackHandler
 from llama_index.core.tools import FunctionTool
 
-from tools import search, scrape  # Import the tools we defined
-
-# Configure logger
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+# Import the tools we defined (sync and async variants)
+from tools import (
+    search,
+    scrape,
+    scrape_many,
+    async_search,
+    async_scrape,
+    async_scrape_many,
+    reset_run_cache,
+    get_run_scraped_urls,
+    compress_text,
+    decompress_text,
 )
+
+# Logging configuration is owned by the entry point (app.py or the
+# __main__ block below); modules only create their logger.
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-dotenv.load_dotenv()
+# Bump this whenever the generation prompts change so stale cached articles
+# are not served for the new prompts.
+PROMPT_TEMPLATE_VERSION = "v3"
+
+# Cache key shared by all our OpenAI calls so the provider's automatic
+# prompt caching can reuse the tokenized static prefix across turns.
+OPENAI_PROMPT_CACHE_KEY = "article-gen-v1"
+
+# Prompt templates are module-level constants with a byte-identical static
+# prefix; the variable parts (topic, date, notes) are interpolated at the
+# END so OpenAI's prefix-based prompt caching gets the longest possible hit.
+RESEARCH_PROMPT_TEMPLATE = """
+        You are a meticulous research assistant gathering material for an article on the topic given at the end of this prompt.
+
+        Follow these steps:
+        1.  Use the 'search' tool to find relevant articles and sources about the topic. **Prioritize sources published within the last 6 months.**
+        2.  Analyze the search results. Identify promising URLs that likely contain detailed and recent information (published within the last 6 months if possible).
+        3.  Use the 'scrape_many' tool to extract the main content (in markdown format) from the selected URLs. **Call 'scrape_many' once with the full list of 3-5 URLs** instead of scraping them one by one; use the single-URL 'scrape' tool only for individual follow-up pages. Scrape at least 2-3 different sources to ensure a comprehensive overview. **Keep track of the URLs you successfully scrape content from.**
+        4.  Do NOT write an article. Instead, output your research notes as a markdown bullet list of the key facts, figures, dates and findings you gathered, each attributed to its source URL. **Only include facts found in the scraped content.**
+        5.  End your notes with a section titled 'Scraped sources' listing every URL you successfully scraped content from in step 3.
+        6.  If you encounter errors during search or scraping, try alternative queries or URLs, but if you cannot gather sufficient information after a reasonable number of attempts (especially recent information), state plainly that you were unable to gather sufficient material.
+
+        Today's date is {current_date}.
+        Topic: "{keywords}"
+
+        Produce the research notes now.
+        """
+
+SYNTHESIS_PROMPT_TEMPLATE = """
+        You are an expert writer tasked with creating a comprehensive and engaging article.
+        Your goal is to synthesize the research notes given at the end of this prompt into a single, well-structured HTML article on the given topic.
+
+        Requirements:
+        1.  Write a single, coherent article based *only* on the research notes. Do not add information not present in the notes.
+        2.  Format the article strictly as HTML. Use appropriate tags like <h1>, <h2>, <p>, <ul>, <li>, <strong>, etc. for structure and readability.
+        3.  The article should be informative, well-organized, and easy to read, reflecting the most current information available in the notes.
+        4.  Include a brief introductory paragraph and a concluding summary.
+        5.  **At the end of the article, add a section titled 'Sources' (e.g., using an <h2> tag). Under this heading, list the URLs from the 'Scraped sources' section of the notes as an unordered list (<ul><li><a>...</a></li></ul>).**
+        6.  Do NOT include any preamble like "Here is the HTML article:". Just output the raw HTML starting with the <h1> tag and ending with the sources list.
+        7.  If the research notes state that insufficient material could be gathered, output a simple HTML paragraph saying the article could not be generated due to lack of suitable sources.
+
+        Today's date is {current_date}.
+        Topic: "{keywords}"
+
+        Research notes:
+        {research_notes}
+
+        Generate the HTML article now.
+        """
+
+# Persistent cache for generated articles, keyed by (model, prompt version,
+# keywords). A repeated request skips the entire ReAct loop.
+ARTICLE_CACHE_DIR = ".article_cache"
+ARTICLE_CACHE_TTL_SECONDS = 7 * 24 * 3600  # 7 days
+
+# Embedding model and cache keys for the semantic (near-duplicate) cache.
+EMBEDDING_MODEL = "text-embedding-3-small"
+SEMANTIC_EMBEDDINGS_KEY = "semantic:embeddings"
+SEMANTIC_KEYS_KEY = "semantic:keys"
+
+
+# Expected shape of a finished article: starts with <h1>, contains a
+# Sources heading and ends with the closing sources list. Checked in one
+# compiled-regex pass; failures are repaired locally instead of paying
+# another LLM turn to reformat.
+_HTML_OK = re.compile(
+    r"^\s*<h1[^>]*>.+?<h2[^>]*>\s*Sources\s*</h2>.*?</(ul|ol)>\s*$",
+    re.S | re.I,
+)
+_H1_RE = re.compile(r"\s*<h1[^>]*>", re.I)
+_SOURCES_RE = re.compile(r"<h2[^>]*>\s*Sources\s*</h2>", re.I)
+
+
+class _ScrapeProgressHandler(BaseCallbackHandler):
+    """Callback handler tracking how much scraped material the agent gathered.
+
+    Counts successful scrapes and the bytes contributed by the last tool
+    call, so the generation loop can stop the agent early once additional
+    steps stop producing meaningful new material.
+    """
+
+    def __init__(self):
+        super().__init__(event_starts_to_ignore=[], event_ends_to_ignore=[])
+        self.successful_scrapes = 0
+        self.total_bytes = 0
+        self.last_bytes_delta = 0
+        # FUNCTION_CALL end events carry only the tool output, so remember
+        # which tool each event belongs to from the start event.
+        self._event_tools = {}
+
+    def _record_output(self, output: str) -> None:
+        """Counts a single scrape result, ignoring error/warning payloads."""
+        stripped = output.lstrip()
+        if stripped.startswith('{"error"') or stripped.startswith('{"warning"'):
+            return
+        self.successful_scrapes += 1
+        self.last_bytes_delta += len(output)
+        self.total_bytes += len(output)
+
+    def on_event_start(self, event_type, payload=None, event_id="", **kwargs):
+        # The tool metadata is only present on the start payload; stash the
+        # tool name so the end event (output only) can be attributed.
+        if event_type == CBEventType.FUNCTION_CALL and payload:
+            tool = payload.get(EventPayload.TOOL)
+            if tool is not None:
+                self._event_tools[event_id] = tool.name
+        return event_id
+
+    def on_event_end(self, event_type, payload=None, event_id="", **kwargs):
+        if event_type != CBEventType.FUNCTION_CALL or not payload:
+            return
+        tool_name = self._event_tools.pop(event_id, None)
+        output = payload.get(EventPayload.FUNCTION_OUTPUT)
+        if tool_name is None or output is None:
+            return
+        self.last_bytes_delta = 0
+        if tool_name == "scrape":
+            self._record_output(str(output))
+        elif tool_name in ("scrape_many", "async_scrape_many"):
+            try:
+                results = json.loads(str(output))
+            except json.JSONDecodeError:
+                return
+            if isinstance(results, dict) and "error" not in results:
+                for content in results.values():
+                    self._record_output(content)
+
+    def start_trace(self, trace_id=None):
+        pass
+
+    def end_trace(self, trace_id=None, trace_map=None):
+        pass
 
 
 class ArticleGenerator:
@@ -25,32 +174,99 @@ class ArticleGenerator:
     the article.
     """
 
-    def __init__(self, model_name: str = "gpt-4.1", max_iterations: int = 15):
+    def __init__(
+        self,
+        model_name: str = "gpt-4.1",
+        research_model_name: str = "gpt-4.1-mini",
+        max_iterations: int = 15,
+        similarity_threshold: float = 0.92,
+        early_stop_min_scrapes: int = 3,
+        early_stop_min_bytes_delta: int = 500,
+    ):
         """Initializes the ArticleGenerator.
 
         Args:
-            model_name: The OpenAI model to use (defaults to "gpt-4.1").
+            model_name: The OpenAI model used for the final article synthesis
+                (defaults to "gpt-4.1").
+            research_model_name: The cheaper/faster OpenAI model used for the
+                ReAct tool loop (defaults to "gpt-4.1-mini") - deciding what
+                to search and scrape doesn't need the big model.
             max_iterations: Maximum steps the agent can take.
+            similarity_threshold: Minimum cosine similarity between keyword
+                embeddings for a prior article to count as a semantic cache
+                hit (defaults to 0.92).
+            early_stop_min_scrapes: Minimum number of successfully scraped
+                pages before the agent may be stopped early (defaults to 3).
+            early_stop_min_bytes_delta: If the last tool step contributed
+                fewer scraped bytes than this once enough pages are in, the
+                agent is told to wrap up (defaults to 500).
         """
         try:
             openai_api_key = os.environ["OPENAI_API_KEY"]
             if not openai_api_key:
                 raise ValueError("OPENAI_API_KEY is not set in the environment.")
 
-            self.llm = OpenAI(model=model_name, api_key=openai_api_key)
-            logger.info(f"Using LLM model: {model_name}")
+            self.model_name = model_name
+            self.research_model_name = research_model_name
+            # Cascade: the small model drives the tool loop, the big model
+            # only renders the final article from the gathered notes.
+            # reuse_client=False: the generator outlives the short-lived
+            # asyncio.run loops app.py starts per click, and a reused async
+            # client stays bound to the first (closed) loop.
+            self.research_llm = OpenAI(
+                model=research_model_name,
+                api_key=openai_api_key,
+                additional_kwargs={"prompt_cache_key": OPENAI_PROMPT_CACHE_KEY},
+                reuse_client=False,
+            )
+            self.synthesis_llm = OpenAI(
+                model=model_name,
+                api_key=openai_api_key,
+                additional_kwargs={"prompt_cache_key": OPENAI_PROMPT_CACHE_KEY},
+                reuse_client=False,
+            )
+            logger.info(
+                "Using LLM models: %s (research), %s (synthesis)",
+                research_model_name,
+                model_name,
+            )
 
-            # Create FunctionTool instances for the agent
-            search_tool = FunctionTool.from_defaults(fn=search)
-            scrape_tool = FunctionTool.from_defaults(fn=scrape)
+            # Disk-backed cache so repeated keyword requests return instantly
+            # instead of re-running the agent (and re-paying the API cost).
+            self.article_cache = Cache(ARTICLE_CACHE_DIR)
 
-            self.agent = ReActAgent.from_tools(
-                [search_tool, scrape_tool],
-                llm=self.llm,
-                max_iterations=max_iterations,
-                verbose=True,  # Enable logging of agent steps
+            # Semantic cache: embeddings of prior keyword strings plus the
+            # article cache keys they map to, so near-duplicate queries
+            # (e.g. "solar power" vs "solar energy") reuse prior articles.
+            self.similarity_threshold = similarity_threshold
+            self.embedding_client = openai.OpenAI(api_key=openai_api_key)
+            self._semantic_embeddings = self.article_cache.get(
+                SEMANTIC_EMBEDDINGS_KEY
             )
-            logger.info(f"ReActAgent initialized with search and scrape tools.")
+            self._semantic_keys = self.article_cache.get(SEMANTIC_KEYS_KEY) or []
+
+            # Create FunctionTool instances for the agent. Registering the
+            # async variants lets the agent dispatch tool calls concurrently
+            # on the event loop when driven via achat.
+            search_tool = FunctionTool.from_defaults(fn=search, async_fn=async_search)
+            scrape_tool = FunctionTool.from_defaults(fn=scrape, async_fn=async_scrape)
+            scrape_many_tool = FunctionTool.from_defaults(
+                fn=scrape_many, async_fn=async_scrape_many
+            )
+
+            # Thresholds for stopping research early once additional steps
+            # yield little new material; the counters themselves live in a
+            # per-run handler (see _arun_research).
+            self.early_stop_min_scrapes = early_stop_min_scrapes
+            self.early_stop_min_bytes_delta = early_stop_min_bytes_delta
+
+            # Tools and settings are shared; the agent itself is built fresh
+            # for each research run (see _create_agent) so one run's
+            # conversation memory and task state never leak into another -
+            # essential now that the generator is shared process-wide.
+            self._tools = [search_tool, scrape_tool, scrape_many_tool]
+            self.max_iterations = max_iterations
+            logger.info("Search and scrape tools initialized for the agent.")
 
         except KeyError:
             logger.error("OPENAI_API_KEY not found in .env file.")
@@ -62,63 +278,419 @@ class ArticleGenerator:
             logger.error(f"Error initializing ArticleGenerator: {e}")
             raise
 
+    def _cache_key(self, keywords: str) -> str:
+        """Builds the article cache key for the given keywords.
+
+        The key covers the model and prompt template version so cached
+        articles are invalidated when either changes.
+
+        Args:
+            keywords: The keywords or topic for the article.
+
+        Returns:
+            A hex digest usable as a cache key.
+        """
+        raw = (
+            f"{self.model_name}||{self.research_model_name}||"
+            f"{PROMPT_TEMPLATE_VERSION}||{keywords}"
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _cache_get_article(self, cache_key: str) -> str | None:
+        """Reads an article from the cache, decompressing it if needed.
+
+        Args:
+            cache_key: The article cache key.
+
+        Returns:
+            The article HTML, or None on a cache miss.
+        """
+        value = self.article_cache.get(cache_key)
+        # Entries written before compression was added are plain str.
+        if isinstance(value, bytes):
+            return decompress_text(value)
+        return value
+
+    def _cache_set_article(self, cache_key: str, article_html: str) -> None:
+        """Stores an article in the cache, zstd-compressed.
+
+        Args:
+            cache_key: The article cache key.
+            article_html: The article HTML to store.
+        """
+        self.article_cache.set(
+            cache_key, compress_text(article_html), expire=ARTICLE_CACHE_TTL_SECONDS
+        )
+
+    def _embed(self, text: str) -> np.ndarray:
+        """Embeds a text string with the OpenAI embeddings API.
+
+        Args:
+            text: The text to embed.
+
+        Returns:
+            The embedding as a float32 NumPy vector.
+        """
+        response = self.embedding_client.embeddings.create(
+            model=EMBEDDING_MODEL, input=text
+        )
+        return np.asarray(response.data[0].embedding, dtype=np.float32)
+
+    def _semantic_lookup(self, query_embedding: np.ndarray) -> str | None:
+        """Looks up a cached article whose keywords are semantically close.
+
+        Computes cosine similarity between the query embedding and all prior
+        keyword embeddings; if the best match clears the threshold, the
+        corresponding cached article is returned.
+
+        Args:
+            query_embedding: Embedding of the incoming keywords.
+
+        Returns:
+            The cached article HTML, or None if there is no close-enough match.
+        """
+        if self._semantic_embeddings is None or len(self._semantic_keys) == 0:
+            return None
+        norms = np.linalg.norm(self._semantic_embeddings, axis=1)
+        qnorm = np.linalg.norm(query_embedding)
+        similarities = self._semantic_embeddings @ query_embedding / (norms * qnorm)
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            return None
+        logger.info(
+            "Semantic cache match (similarity %.3f) for key %s",
+            similarities[best],
+            self._semantic_keys[best],
+        )
+        # The article itself may have expired from the cache in the meantime.
+        return self._cache_get_article(self._semantic_keys[best])
+
+    def _semantic_store(self, query_embedding: np.ndarray, cache_key: str) -> None:
+        """Adds a keyword embedding to the semantic index and persists it.
+
+        Args:
+            query_embedding: Embedding of the keywords just generated for.
+            cache_key: The article cache key the embedding should resolve to.
+        """
+        row = query_embedding.reshape(1, -1)
+        if self._semantic_embeddings is None:
+            self._semantic_embeddings = row
+        else:
+            self._semantic_embeddings = np.vstack([self._semantic_embeddings, row])
+        self._semantic_keys.append(cache_key)
+        self.article_cache.set(SEMANTIC_EMBEDDINGS_KEY, self._semantic_embeddings)
+        self.article_cache.set(SEMANTIC_KEYS_KEY, self._semantic_keys)
+
+    def _finalize_article(
+        self,
+        keywords: str,
+        cache_key: str,
+        query_embedding: np.ndarray | None,
+        article_html: str,
+    ) -> str:
+        """Post-processes a freshly generated article and stores it in the caches.
+
+        Args:
+            keywords: The keywords the article was generated for.
+            cache_key: The article cache key for these keywords.
+            query_embedding: Embedding of the keywords, if one was computed.
+            article_html: The raw article text returned by the agent.
+
+        Returns:
+            The (possibly repaired) article HTML.
+        """
+        logger.info("Successfully generated article for keywords: '%s'", keywords)
+        article_html = article_html.strip()
+        if not _HTML_OK.match(article_html):
+            logger.warning(
+                "Generated article failed the HTML shape check; repairing locally."
+            )
+            article_html = self._repair_html(keywords, article_html)
+        self._cache_set_article(cache_key, article_html)
+        if query_embedding is not None:
+            self._semantic_store(query_embedding, cache_key)
+        return article_html
+
+    def _repair_html(self, keywords: str, article_html: str) -> str:
+        """Repairs common shape problems in the agent's HTML output.
+
+        Args:
+            keywords: The keywords the article was generated for (used as a
+                fallback title).
+            article_html: The article HTML that failed the shape check.
+
+        Returns:
+            The repaired article HTML (best effort).
+        """
+        if not article_html.startswith("<"):
+            logger.warning(
+                "Agent response doesn't look like HTML. Wrapping in <p> tags."
+            )
+            article_html = f"<p>{article_html}</p>"
+        if not _H1_RE.match(article_html):
+            logger.warning(
+                "Article is missing a leading <h1>; adding one from the keywords."
+            )
+            article_html = f"<h1>{keywords.strip().capitalize()}</h1>\n{article_html}"
+        if not _SOURCES_RE.search(article_html):
+            scraped_urls = get_run_scraped_urls()
+            if scraped_urls:
+                logger.warning(
+                    "Article is missing a Sources section; appending scraped URLs."
+                )
+                items = "\n".join(
+                    f'<li><a href="{url}">{url}</a></li>' for url in scraped_urls
+                )
+                article_html = (
+                    f"{article_html}\n<h2>Sources</h2>\n<ul>\n{items}\n</ul>"
+                )
+        return article_html
+
     def generate(self, keywords: str) -> str:
         """Generates an HTML article based on the provided keywords.
 
+        Synchronous wrapper around :meth:`agenerate` for callers without a
+        running event loop.
+
         Args:
             keywords: The keywords or topic for the article.
 
         Returns:
             The generated article as an HTML string, or an error message.
         """
-        logger.info(f"Generating article for keywords: '{keywords}'")
+        return asyncio.run(self.agenerate(keywords))
 
-        # Get current date
-        current_date = datetime.now().strftime("%Y-%m-%d")
-
-        # Define the prompt for the ReAct agent
-        # Instructing it to use search and scrape, format as HTML, and use recent info
-        prompt = f"""
-        You are an expert writer tasked with creating a comprehensive and engaging article.
-        Your goal is to synthesize information from multiple reliable sources to produce a single, well-structured HTML article about: "{keywords}".
+    async def agenerate(self, keywords: str) -> str:
+        """Generates an HTML article based on the provided keywords.
 
-        Today's date is {current_date}.
+        Drives the agent asynchronously so independent LLM and tool calls
+        can overlap on the event loop.
 
-        Follow these steps:
-        1.  Use the 'search' tool to find relevant articles and sources about "{keywords}". **Prioritize sources published within the last 6 months.**
-        2.  Analyze the search results. Identify promising URLs that likely contain detailed and recent information (published within the last 6 months if possible).
-        3.  Use the 'scrape' tool to extract the main content (in markdown format) from the selected URLs. Scrape at least 2-3 different sources to ensure a comprehensive overview. **Keep track of the URLs you successfully scrape content from.**
-        4.  Synthesize the information gathered from the scraped content. **Focus on information confirmed by recent sources (last 6 months).**
-        5.  Write a single, coherent article based *only* on the information you scraped. Do not add information not present in the sources.
-        6.  Format the final article strictly as HTML. Use appropriate tags like <h1>, <h2>, <p>, <ul>, <li>, <strong>, etc. for structure and readability.
-        7.  The article should be informative, well-organized, and easy to read, reflecting the most current information available in your sources.
-        8.  Include a brief introductory paragraph and a concluding summary.
-        9.  **At the end of the article, add a section titled 'Sources' (e.g., using an <h2> tag). Under this heading, list the URLs you successfully scraped content from in step 3, ideally as an unordered list (<ul><li><a>...</a></li></ul>).**
-        10. Do NOT include any preamble like "Here is the HTML article:". Just output the raw HTML starting with the <h1> tag and ending with the sources list.
-        11. If you encounter errors during search or scraping, try alternative queries or URLs, but if you cannot gather sufficient information after a reasonable number of attempts (especially recent information), state that you were unable to generate the article due to lack of suitable sources (as a simple HTML paragraph).
+        Args:
+            keywords: The keywords or topic for the article.
 
-        Generate the HTML article now.
+        Returns:
+            The generated article as an HTML string, or an error message.
         """
+        logger.info("Generating article for keywords: '%s'", keywords)
+
+        cache_key, cached_html, query_embedding = self._check_caches(keywords)
+        if cached_html is not None:
+            return cached_html
 
         try:
-            response = self.agent.chat(prompt)
-            # The agent's final response should be the HTML article
-            article_html = response.response
-            logger.info(f"Successfully generated article for keywords: '{keywords}'")
-            # Basic check if the output looks like HTML
-            if not article_html.strip().startswith("<"):
-                logger.warning(
-                    "Agent response doesn't look like HTML. Wrapping in <p> tags."
-                )
-                article_html = f"<p>{article_html}</p>"
-            return article_html
+            # Research phase: the small model gathers facts via the tools.
+            research_notes = await self._arun_research(
+                self._build_research_prompt(keywords)
+            )
+            # Synthesis phase: one call to the big model renders the article.
+            completion = await self.synthesis_llm.acomplete(
+                self._build_synthesis_prompt(keywords, research_notes)
+            )
+            return self._finalize_article(
+                keywords, cache_key, query_embedding, completion.text
+            )
         except Exception as e:
             logger.error(f"Error during article generation for '{keywords}': {e}")
             return f"<p>Error generating article: {e}</p>"
 
+    async def astream_generate(self, keywords: str):
+        """Generates an HTML article, yielding it incrementally.
+
+        Yields progressively longer snapshots of the article so callers can
+        render progress instead of waiting for the full article; the last
+        yielded value is the finalized (shape-checked and repaired) article,
+        which may differ from the raw streamed text. Cached articles are
+        yielded as a single snapshot.
+
+        Args:
+            keywords: The keywords or topic for the article.
+
+        Yields:
+            The article HTML generated so far (or an error message); the
+            final value is the complete article.
+        """
+        logger.info("Streaming article for keywords: '%s'", keywords)
+
+        cache_key, cached_html, query_embedding = self._check_caches(keywords)
+        if cached_html is not None:
+            yield cached_html
+            return
+
+        try:
+            # Research phase: the small model gathers facts via the tools.
+            research_notes = await self._arun_research(
+                self._build_research_prompt(keywords)
+            )
+            # Synthesis phase: stream the big model's article rendering.
+            chunks = []
+            stream = await self.synthesis_llm.astream_complete(
+                self._build_synthesis_prompt(keywords, research_notes)
+            )
+            async for completion in stream:
+                chunks.append(completion.delta)
+                yield "".join(chunks)
+            # Post-process and cache the complete article, and hand the
+            # finalized version back so callers keep any local repairs.
+            yield self._finalize_article(
+                keywords, cache_key, query_embedding, "".join(chunks)
+            )
+        except Exception as e:
+            logger.error(f"Error during article generation for '{keywords}': {e}")
+            yield f"<p>Error generating article: {e}</p>"
+
+    def _should_stop_early(self, progress: _ScrapeProgressHandler) -> bool:
+        """Decides whether the research agent has gathered enough material.
+
+        Args:
+            progress: The current run's scrape progress handler.
+
+        Returns:
+            True if enough pages were scraped and the last tool step added
+            less new material than the configured threshold.
+        """
+        return (
+            progress.successful_scrapes >= self.early_stop_min_scrapes
+            and progress.last_bytes_delta < self.early_stop_min_bytes_delta
+        )
+
+    def _create_agent(self, progress: _ScrapeProgressHandler) -> ReActAgent:
+        """Builds a fresh ReAct agent for a single research run.
+
+        The LLM clients and tool schemas are shared and cheap to reference;
+        constructing the agent itself per run gives each run its own
+        conversation memory and task state, so nothing carries over between
+        runs (or between users, now that the generator is process-wide) and
+        finished tasks are simply garbage-collected with the agent.
+
+        Args:
+            progress: This run's scrape progress handler.
+
+        Returns:
+            A new ReActAgent wired to the shared tools and the handler.
+        """
+        return ReActAgent.from_tools(
+            self._tools,
+            llm=self.research_llm,
+            max_iterations=self.max_iterations,
+            callback_manager=CallbackManager([progress]),
+            verbose=True,  # Enable logging of agent steps
+        )
+
+    async def _arun_research(self, prompt: str) -> str:
+        """Runs the research agent step by step with early stopping.
+
+        Instead of always letting the agent spend its full iteration budget,
+        the task is advanced one step at a time; once enough material has
+        been gathered and the information gain per step has flattened, the
+        agent is told to stop using tools and produce its notes.
+
+        Args:
+            prompt: The research prompt for the agent.
+
+        Returns:
+            The research notes produced by the agent.
+        """
+        reset_run_cache()  # fresh URL dedup / domain limits for this run
+        progress = _ScrapeProgressHandler()
+        agent = self._create_agent(progress)
+        task = agent.create_task(prompt)
+        nudged = False
+        step_output = await agent.arun_step(task.task_id)
+        while not step_output.is_last:
+            if not nudged and self._should_stop_early(progress):
+                logger.info(
+                    "Early stop: %d pages scraped and information gain "
+                    "flattened. Asking the agent to wrap up.",
+                    progress.successful_scrapes,
+                )
+                nudged = True
+                step_output = await agent.arun_step(
+                    task.task_id,
+                    input=(
+                        "You have gathered sufficient material. Do not call "
+                        "any more tools; produce the research notes now, "
+                        "following the requested format."
+                    ),
+                )
+                continue
+            step_output = await agent.arun_step(task.task_id)
+        response = agent.finalize_response(task.task_id, step_output)
+        return response.response
+
+    def _check_caches(
+        self, keywords: str
+    ) -> tuple[str, str | None, np.ndarray | None]:
+        """Consults the exact and semantic article caches for the keywords.
+
+        Args:
+            keywords: The keywords or topic for the article.
+
+        Returns:
+            A tuple of (cache key, cached article HTML or None, keyword
+            embedding or None if embedding failed or was not needed).
+        """
+        # Check the persistent cache first: a hit skips the whole agent run.
+        cache_key = self._cache_key(keywords)
+        cached_html = self._cache_get_article(cache_key)
+        if cached_html is not None:
+            logger.info("Article cache hit for keywords: '%s'", keywords)
+            return cache_key, cached_html, None
+
+        # No exact match: try the semantic cache for near-duplicate keywords.
+        # Embedding failures must not block generation, so degrade gracefully.
+        query_embedding = None
+        try:
+            query_embedding = self._embed(keywords)
+            semantic_html = self._semantic_lookup(query_embedding)
+            if semantic_html is not None:
+                logger.info("Semantic cache hit for keywords: '%s'", keywords)
+                return cache_key, semantic_html, query_embedding
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {e}")
+        return cache_key, None, query_embedding
+
+    def _build_research_prompt(self, keywords: str) -> str:
+        """Builds the research prompt for the ReAct agent.
+
+        The agent (running on the small model) only gathers material here;
+        it must not write the article itself.
+
+        Args:
+            keywords: The keywords or topic for the article.
+
+        Returns:
+            The full research prompt string.
+        """
+        return RESEARCH_PROMPT_TEMPLATE.format(
+            current_date=datetime.now().strftime("%Y-%m-%d"),
+            keywords=keywords,
+        )
+
+    def _build_synthesis_prompt(self, keywords: str, research_notes: str) -> str:
+        """Builds the final synthesis prompt for the big model.
+
+        Args:
+            keywords: The keywords or topic for the article.
+            research_notes: The research notes produced by the agent.
+
+        Returns:
+            The full synthesis prompt string.
+        """
+        return SYNTHESIS_PROMPT_TEMPLATE.format(
+            current_date=datetime.now().strftime("%Y-%m-%d"),
+            keywords=keywords,
+            research_notes=research_notes,
+        )
+
 
 if __name__ == "__main__":
-    # Example usage (for testing)
+    # Example usage (for testing); when run directly there is no app.py to
+    # configure logging or load the environment for us.
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    dotenv.load_dotenv()
     generator = ArticleGenerator()
     test_keywords = "the future of renewable energy in Europe"
     print(f"--- Generating Article ---")
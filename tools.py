@@ -1,33 +1,424 @@
 import os
-import json
-import http.client
+import orjson
+import asyncio
+import contextvars
+import functools
+import hashlib
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import aiohttp
 import dotenv
+import requests
+import zstandard as zstd
+from diskcache import Cache
+from requests.adapters import HTTPAdapter
 from firecrawl import FirecrawlApp
 import logging
 
-# Configure logger
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
-)
+# Logging configuration is owned by the entry point (app.py or the
+# __main__ block below); modules only create their logger.
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-dotenv.load_dotenv()
+@functools.lru_cache(maxsize=1)
+def _firecrawl() -> FirecrawlApp:
+    """Lazily constructs the shared Firecrawl client on first use.
+
+    Deferring construction keeps module import (and thus app startup)
+    cheap; the instance is cached for all subsequent calls.
+
+    Returns:
+        The shared FirecrawlApp instance.
 
-# Initialize Firecrawl App
-try:
-    firecrawl_api_key = os.environ["FIRECRAWL_API_KEY"]
+    Raises:
+        KeyError: If FIRECRAWL_API_KEY is missing from the environment.
+        ValueError: If FIRECRAWL_API_KEY is set but empty.
+    """
+    try:
+        firecrawl_api_key = os.environ["FIRECRAWL_API_KEY"]
+    except KeyError:
+        logger.error("FIRECRAWL_API_KEY not found in .env file.")
+        raise
     if not firecrawl_api_key:
         raise ValueError("FIRECRAWL_API_KEY is not set in the environment.")
-    firecrawl_app = FirecrawlApp(api_key=firecrawl_api_key)
-except KeyError:
-    logger.error("FIRECRAWL_API_KEY not found in .env file.")
-    raise
-except ValueError as e:
-    logger.error(e)
-    raise
+    return FirecrawlApp(api_key=firecrawl_api_key)
+
+
+# Firecrawl REST endpoint used for the concurrent batch scraper.
+FIRECRAWL_SCRAPE_ENDPOINT = "https://api.firecrawl.dev/v1/scrape"
+
+# Serper search endpoint, reached through a persistent session so repeated
+# searches reuse the same TCP/TLS connection instead of re-handshaking.
+SERPER_SEARCH_ENDPOINT = "https://google.serper.dev/search"
+_serper_session = requests.Session()
+_serper_session.mount(
+    "https://google.serper.dev",
+    HTTPAdapter(pool_connections=10, pool_maxsize=10),
+)
+
+# Shared scrape options for both the single-URL and batch scrapers.
+SCRAPE_PARAMS = {
+    "formats": ["markdown"],
+    "excludeTags": [
+        "script",
+        "style",
+        "svg",
+        "iframe",
+        "footer",
+        "nav",
+        "header",
+    ],
+    "onlyMainContent": True,  # Focus on the main article content
+    "waitFor": 1000,
+}
+
+# Limit content length slightly to prevent excessive context
+MAX_CONTENT_LENGTH = 10000
+
+# Streaming read settings for the single-URL scraper: stop pulling bytes
+# once we have comfortably more than the content cap (the factor covers the
+# JSON envelope and escape overhead) instead of downloading whole pages.
+STREAM_CHUNK_SIZE = 8192
+STREAM_BYTE_BUDGET = 4 * MAX_CONTENT_LENGTH
+
+# Disk-backed memoization for tool results: identical queries/URLs across
+# runs hit the local cache instead of Serper/Firecrawl. Searches go stale
+# quickly, scraped page content much less so.
+_tool_cache = Cache(".tool_cache")
+SEARCH_CACHE_TTL_SECONDS = 3600  # 1 hour
+SCRAPE_CACHE_TTL_SECONDS = 86400  # 24 hours
+
+# Per-agent-run scrape state: the LLM sometimes re-requests a URL it has
+# already seen, or piles onto a single low-value domain. Both structures are
+# reset at the start of each generation via reset_run_cache().
+_run_scrape_cache: contextvars.ContextVar[dict | None] = contextvars.ContextVar(
+    "run_scrape_cache", default=None
+)
+_run_domain_counts: contextvars.ContextVar[Counter | None] = contextvars.ContextVar(
+    "run_domain_counts", default=None
+)
+# Speculative prefetch results live apart from the agent-requested state:
+# only scrapes the agent actually asked for should appear in the Sources
+# fallback or count toward the per-domain limit.
+_run_prefetch_cache: contextvars.ContextVar[dict | None] = contextvars.ContextVar(
+    "run_prefetch_cache", default=None
+)
+MAX_SCRAPES_PER_DOMAIN = 2
+
+
+def reset_run_cache() -> None:
+    """Starts fresh per-run scrape state.
+
+    Called by the article generator at the beginning of each agent run so
+    URL deduplication and domain limits apply within a single run only.
+    """
+    _run_scrape_cache.set({})
+    _run_domain_counts.set(Counter())
+    _run_prefetch_cache.set({})
+
+
+def get_run_scraped_urls() -> list[str]:
+    """Returns the URLs successfully scraped during the current agent run.
+
+    Returns:
+        The canonicalized URLs whose scrapes returned content (errors and
+        warnings excluded), in scrape order.
+    """
+    run_cache = _run_scrape_cache.get()
+    if not run_cache:
+        return []
+    return [url for url, result in run_cache.items() if not _is_error_payload(result)]
+
+
+def _canonicalize_url(url: str) -> str:
+    """Canonicalizes a URL so trivially different spellings compare equal.
+
+    Lowercases the scheme and host, sorts the query parameters and strips
+    the fragment.
+
+    Args:
+        url: The URL to canonicalize.
+
+    Returns:
+        The canonical form of the URL.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query)))
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path, query, "")
+    )
+
+
+def _run_cache_lookup(canonical_url: str, host: str) -> str | None:
+    """Consults the per-run scrape state before hitting Firecrawl.
+
+    Args:
+        canonical_url: The canonicalized URL about to be scraped.
+        host: The URL's host.
+
+    Returns:
+        A previously scraped result for this URL, a warning payload if the
+        host has hit the per-run domain limit, or None to proceed.
+    """
+    run_cache = _run_scrape_cache.get()
+    if run_cache is not None and canonical_url in run_cache:
+        logger.info("Run cache hit for URL: %s", canonical_url)
+        return run_cache[canonical_url]
+    domain_counts = _run_domain_counts.get()
+    if domain_counts is not None and domain_counts[host] >= MAX_SCRAPES_PER_DOMAIN:
+        logger.info("Per-run domain limit reached for host: %s", host)
+        return orjson.dumps(
+            {
+                "warning": f"Domain limit reached for {host} in this run; "
+                f"scrape a different site instead."
+            }
+        ).decode()
+    return None
+
+
+def _run_cache_store(canonical_url: str, host: str, result: str) -> None:
+    """Records a scrape result in the per-run state.
+
+    Args:
+        canonical_url: The canonicalized URL that was scraped.
+        host: The URL's host.
+        result: The scrape result (errors are remembered for dedup but do
+            not count toward the domain limit).
+    """
+    run_cache = _run_scrape_cache.get()
+    if run_cache is not None:
+        run_cache[canonical_url] = result
+    domain_counts = _run_domain_counts.get()
+    if domain_counts is not None and not _is_error_payload(result):
+        domain_counts[host] += 1
+
+
+def _promote_prefetched(canonical_url: str, host: str) -> str | None:
+    """Moves a prefetched result into the agent-requested run state.
+
+    Called when the agent explicitly asks for a URL: from this point on the
+    scrape counts toward the domain limit and appears in the Sources
+    fallback, exactly as if the agent had fetched it itself.
+
+    Args:
+        canonical_url: The canonicalized URL the agent requested.
+        host: The URL's host.
+
+    Returns:
+        The prefetched result, or None if this URL was not prefetched.
+    """
+    prefetch_cache = _run_prefetch_cache.get()
+    if prefetch_cache is None:
+        return None
+    result = prefetch_cache.pop(canonical_url, None)
+    if result is None:
+        return None
+    logger.info("Prefetch hit for URL: %s", canonical_url)
+    _run_cache_store(canonical_url, host, result)
+    return result
+
+
+# Compression level for cached values: text (HTML, markdown, search JSON)
+# compresses 4-6x at level 3, shrinking the cache directories and the bytes
+# read back on a cold hit.
+ZSTD_LEVEL = 3
+
+
+def compress_text(text: str) -> bytes:
+    """Compresses a text value for cache storage.
+
+    A fresh compressor is created per call because zstandard compressor
+    objects are not safe for concurrent use and tool calls may run on
+    worker threads.
+
+    Args:
+        text: The text to compress.
+
+    Returns:
+        The zstd-compressed bytes.
+    """
+    return zstd.ZstdCompressor(level=ZSTD_LEVEL).compress(text.encode("utf-8"))
+
+
+def decompress_text(blob: bytes) -> str:
+    """Decompresses a cache value produced by :func:`compress_text`.
+
+    Args:
+        blob: The zstd-compressed bytes.
+
+    Returns:
+        The original text.
+    """
+    return zstd.ZstdDecompressor().decompress(blob).decode("utf-8")
+
+
+def _is_error_payload(value: str) -> bool:
+    """Checks whether a tool result is an error/warning JSON payload.
+
+    Error results must not be cached, or a transient failure would be
+    replayed for the whole TTL.
+
+    Args:
+        value: The tool's return value.
+
+    Returns:
+        True if the value is a JSON object with an "error" or "warning" key.
+    """
+    try:
+        parsed = orjson.loads(value)
+    except (orjson.JSONDecodeError, TypeError):
+        return False
+    return isinstance(parsed, dict) and ("error" in parsed or "warning" in parsed)
+
+
+def _memo_key(name: str, args: tuple, kwargs: dict) -> str:
+    """Builds the disk-cache key for a memoized tool call.
+
+    Args:
+        name: The memoized function's name.
+        args: The call's positional arguments.
+        kwargs: The call's keyword arguments.
+
+    Returns:
+        The sha256 hex digest used as the cache key.
+    """
+    raw_key = f"{name}:{repr(args)}:{repr(kwargs)}"
+    return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+
+def _memo_get(key: str) -> str | None:
+    """Reads a memoized tool result from the disk cache.
+
+    Args:
+        key: The cache key from :func:`_memo_key`.
+
+    Returns:
+        The cached value, or None on a miss.
+    """
+    cached = _tool_cache.get(key)
+    if cached is None:
+        return None
+    # Entries written before compression was added are plain str.
+    return decompress_text(cached) if isinstance(cached, bytes) else cached
+
+
+def _memo_put(key: str, value: str, ttl: int) -> None:
+    """Writes a tool result to the disk cache unless it is an error.
+
+    Args:
+        key: The cache key from :func:`_memo_key`.
+        value: The tool's return value.
+        ttl: How long the cached result stays valid, in seconds.
+    """
+    if not _is_error_payload(value):
+        _tool_cache.set(key, compress_text(value), expire=ttl)
+
+
+def _memo(ttl: int):
+    """Decorator memoizing a tool function's results on disk.
+
+    Args:
+        ttl: How long cached results stay valid, in seconds.
+
+    Returns:
+        The decorator wrapping the tool function.
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = _memo_key(fn.__name__, args, kwargs)
+            cached = _memo_get(key)
+            if cached is not None:
+                logger.info("Tool cache hit for %s%s", fn.__name__, args)
+                return cached
+            value = fn(*args, **kwargs)
+            _memo_put(key, value, ttl)
+            return value
+
+        return wrapper
+
+    return decorator
 
 
+def _truncate_markdown(url: str, markdown_content: str) -> str:
+    """Truncates scraped markdown to the maximum allowed content length.
+
+    Args:
+        url: The URL the content was scraped from (for logging).
+        markdown_content: The raw markdown content.
+
+    Returns:
+        The markdown content, truncated if it exceeds the limit.
+    """
+    if len(markdown_content) > MAX_CONTENT_LENGTH:
+        logger.warning(
+            "Scraped content from %s truncated to %d characters.",
+            url,
+            MAX_CONTENT_LENGTH,
+        )
+        markdown_content = markdown_content[:MAX_CONTENT_LENGTH] + "... (truncated)"
+    return markdown_content
+
+
+# Speculative prefetch: the agent almost always scrapes some of the top
+# organic results, so start those scrapes in the background as soon as the
+# search returns - they overlap the LLM's next thinking turn and land in
+# the run/disk caches before the agent asks for them.
+PREFETCH_TOP_K = 3
+_prefetch_executor = ThreadPoolExecutor(max_workers=5, thread_name_prefix="prefetch")
+
+
+def _prefetch_one(url: str) -> None:
+    """Scrapes one URL speculatively into the prefetch/disk caches.
+
+    Deliberately bypasses the agent-requested run state: a speculative
+    scrape must not consume domain quota or show up in the Sources
+    fallback unless the agent later asks for the URL (see
+    :func:`_promote_prefetched`).
+
+    Args:
+        url: The URL to prefetch.
+    """
+    canonical_url = _canonicalize_url(url)
+    run_cache = _run_scrape_cache.get()
+    prefetch_cache = _run_prefetch_cache.get()
+    if run_cache is not None and canonical_url in run_cache:
+        return
+    if prefetch_cache is None or canonical_url in prefetch_cache:
+        return
+    result = _scrape_impl(url)
+    prefetch_cache[canonical_url] = result
+
+
+def _prefetch_urls(results_json: str) -> None:
+    """Kicks off background scrapes of the top organic search results.
+
+    Fire-and-forget: results land in the prefetch and disk caches; nothing
+    waits on the futures. Each submission runs in a copy of the current
+    context so the per-run prefetch state (shared dict) is visible to the
+    worker threads.
+
+    Args:
+        results_json: The raw Serper response JSON.
+    """
+    try:
+        results = orjson.loads(results_json)
+    except orjson.JSONDecodeError:
+        return
+    organic = results.get("organic") if isinstance(results, dict) else None
+    if not organic:
+        return
+    for entry in organic[:PREFETCH_TOP_K]:
+        link = entry.get("link")
+        if not link:
+            continue
+        logger.info("Prefetching likely scrape target: %s", link)
+        _prefetch_executor.submit(contextvars.copy_context().run, _prefetch_one, link)
+
+
+@_memo(ttl=SEARCH_CACHE_TTL_SECONDS)
 def search(query: str, num_results: int = 5) -> str:
     """Search for a query on Google using Serper and return the results as a JSON string.
 
@@ -38,35 +429,117 @@ def search(query: str, num_results: int = 5) -> str:
     Returns:
         A JSON string containing the search results, or an error message.
     """
-    logger.info(f"Performing search for query: '{query}'")
-    conn = http.client.HTTPSConnection("google.serper.dev")
+    logger.info("Performing search for query: '%s'", query)
     try:
         serper_api_key = os.environ["SERPER_API_KEY"]
         if not serper_api_key:
             raise ValueError("SERPER_API_KEY is not set in the environment.")
 
-        payload = json.dumps({"q": query, "num": num_results})
-        headers = {
-            "X-API-KEY": serper_api_key,
-            "Content-Type": "application/json",
-        }
-        conn.request("POST", "/search", payload, headers)
-        res = conn.getresponse()
-        data = res.read()
-        conn.close()
-        decoded_data = data.decode("utf-8")
-        logger.info(f"Search successful for query: '{query}'")
+        response = _serper_session.post(
+            SERPER_SEARCH_ENDPOINT,
+            json={"q": query, "num": num_results},
+            headers={"X-API-KEY": serper_api_key},
+            timeout=10,
+        )
+        # Non-200 bodies (e.g. rate-limit messages) must not be cached as
+        # search results for the full TTL.
+        response.raise_for_status()
+        logger.info("Search successful for query: '%s'", query)
+        # Warm the scrape caches while the LLM decides what to do next.
+        _prefetch_urls(response.text)
         # Return the raw JSON string as context for the agent
-        return decoded_data
+        return response.text
     except KeyError:
         logger.error("SERPER_API_KEY not found in .env file.")
-        return json.dumps({"error": "SERPER_API_KEY not found"})
+        return orjson.dumps({"error": "SERPER_API_KEY not found"}).decode()
     except ValueError as e:
         logger.error(e)
-        return json.dumps({"error": str(e)})
+        return orjson.dumps({"error": str(e)}).decode()
     except Exception as e:
         logger.error(f"Error during Serper search for '{query}': {str(e)}")
-        return json.dumps({"error": f"Search failed: {str(e)}"})
+        return orjson.dumps({"error": f"Search failed: {str(e)}"}).decode()
+
+
+def _extract_markdown_prefix(buf: bytes) -> str | None:
+    """Best-effort extraction of the markdown field from truncated JSON.
+
+    When the streaming read is cut at the byte budget, the buffer holds an
+    incomplete Firecrawl response. The markdown field is by far the largest
+    part of the payload, so its head is almost always present; this decodes
+    as much of it as made it into the buffer.
+
+    Args:
+        buf: The (possibly truncated) raw response bytes.
+
+    Returns:
+        The decoded markdown prefix, or None if it could not be located.
+    """
+    text = buf.decode("utf-8", errors="ignore")
+    match = re.search(r'"markdown"\s*:\s*"', text)
+    if match is None:
+        return None
+    fragment = text[match.end() :]
+    # Cut at the field's closing quote if it made it into the buffer
+    # (a quote is closing only if preceded by an even number of backslashes).
+    end = 0
+    while True:
+        end = fragment.find('"', end)
+        if end == -1:
+            break
+        backslashes = 0
+        i = end - 1
+        while i >= 0 and fragment[i] == "\\":
+            backslashes += 1
+            i -= 1
+        if backslashes % 2 == 0:
+            fragment = fragment[:end]
+            break
+        end += 1
+    # The cut may have landed mid-escape sequence; trim until it decodes.
+    for trim in range(7):
+        candidate = fragment[: len(fragment) - trim] if trim else fragment
+        try:
+            return orjson.loads(f'"{candidate}"')
+        except orjson.JSONDecodeError:
+            continue
+    return None
+
+
+def _scrape_streaming(url: str) -> str | None:
+    """Scrapes a URL via the Firecrawl REST API with a bounded read.
+
+    Streams the response and closes the connection once the byte budget is
+    reached, so pages far larger than the content cap don't get fully
+    downloaded and allocated just to be thrown away.
+
+    Args:
+        url: The URL to scrape.
+
+    Returns:
+        The markdown content (possibly truncated to the buffered prefix),
+        or None if it could not be extracted.
+    """
+    headers = {"Authorization": f"Bearer {os.environ['FIRECRAWL_API_KEY']}"}
+    buf = bytearray()
+    truncated_early = False
+    with requests.post(
+        FIRECRAWL_SCRAPE_ENDPOINT,
+        json={"url": url, **SCRAPE_PARAMS},
+        headers=headers,
+        stream=True,
+        timeout=30,
+    ) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            buf.extend(chunk)
+            if len(buf) > STREAM_BYTE_BUDGET:
+                truncated_early = True
+                break
+    if not truncated_early:
+        result = orjson.loads(bytes(buf))
+        return (result.get("data") or {}).get("markdown", "")
+    logger.info("Stopped reading %s at %d bytes (budget reached).", url, len(buf))
+    return _extract_markdown_prefix(bytes(buf))
 
 
 def scrape(url: str) -> str:
@@ -78,62 +551,210 @@ def scrape(url: str) -> str:
     Returns:
         The markdown content of the page, or an error message.
     """
-    logger.info(f"Scraping URL: {url}")
+    canonical_url = _canonicalize_url(url)
+    host = urlsplit(canonical_url).netloc
+    cached = _run_cache_lookup(canonical_url, host)
+    if cached is not None:
+        return cached
+    prefetched = _promote_prefetched(canonical_url, host)
+    if prefetched is not None:
+        return prefetched
+    result = _scrape_impl(url)
+    _run_cache_store(canonical_url, host, result)
+    return result
+
+
+@_memo(ttl=SCRAPE_CACHE_TTL_SECONDS)
+def _scrape_impl(url: str) -> str:
+    """Performs the actual Firecrawl scrape behind the per-run guards.
+
+    Args:
+        url: The URL to scrape.
+
+    Returns:
+        The markdown content of the page, or an error message.
+    """
+    logger.info("Scraping URL: %s", url)
+    try:
+        markdown_content = None
+        try:
+            markdown_content = _scrape_streaming(url)
+        except Exception as e:
+            logger.warning(
+                f"Streaming scrape failed for {url} ({e}); falling back to the SDK."
+            )
+        if markdown_content is None:
+            scrape_result = _firecrawl().scrape_url(url, params=SCRAPE_PARAMS)
+            markdown_content = scrape_result.get("markdown", "")
+        if markdown_content:
+            logger.info("Successfully scraped URL: %s", url)
+            return _truncate_markdown(url, markdown_content)
+        else:
+            logger.warning("No markdown content found for URL: %s", url)
+            return orjson.dumps({"warning": "No markdown content found"}).decode()
+    except Exception as e:
+        logger.error(f"Failed to scrape {url}: {str(e)}")
+        return orjson.dumps({"error": f"Scraping failed: {str(e)}"}).decode()
+
+
+async def _scrape_one(session: aiohttp.ClientSession, url: str) -> str:
+    """Scrapes a single URL via the Firecrawl REST API.
+
+    Args:
+        session: The shared aiohttp session to issue the request on.
+        url: The URL to scrape.
+
+    Returns:
+        The markdown content of the page, or an error message.
+    """
+    canonical_url = _canonicalize_url(url)
+    host = urlsplit(canonical_url).netloc
+    cached = _run_cache_lookup(canonical_url, host)
+    if cached is not None:
+        return cached
+    prefetched = _promote_prefetched(canonical_url, host)
+    if prefetched is not None:
+        return prefetched
+    # Same disk-cache entry as the single-URL path, so batch and single
+    # scrapes of a URL share one memoized result across runs.
+    memo_key = _memo_key("_scrape_impl", (url,), {})
+    memoized = _memo_get(memo_key)
+    if memoized is not None:
+        logger.info("Tool cache hit for _scrape_impl(%r,)", url)
+        _run_cache_store(canonical_url, host, memoized)
+        return memoized
     try:
-        params = {
-            "formats": ["markdown"],
-            "excludeTags": [
-                "script",
-                "style",
-                "svg",
-                "iframe",
-                "footer",
-                "nav",
-                "header",
-            ],
-            "onlyMainContent": True,  # Focus on the main article content
-            "waitFor": 1000,
-        }
-        scrape_result = firecrawl_app.scrape_url(url, params=params)
-        markdown_content = scrape_result.get("markdown", "")
+        payload = {"url": url, **SCRAPE_PARAMS}
+        async with session.post(FIRECRAWL_SCRAPE_ENDPOINT, json=payload) as response:
+            result = await response.json()
+        markdown_content = (result.get("data") or {}).get("markdown", "")
         if markdown_content:
-            logger.info(f"Successfully scraped URL: {url}")
-            # Limit content length slightly to prevent excessive context
-            max_length = 10000
-            if len(markdown_content) > max_length:
-                logger.warning(
-                    f"Scraped content from {url} truncated to {max_length} characters."
-                )
-                markdown_content = markdown_content[:max_length] + "... (truncated)"
-            return markdown_content
+            logger.info("Successfully scraped URL: %s", url)
+            scraped = _truncate_markdown(url, markdown_content)
         else:
-            logger.warning(f"No markdown content found for URL: {url}")
-            return json.dumps({"warning": "No markdown content found"})
+            logger.warning("No markdown content found for URL: %s", url)
+            scraped = orjson.dumps({"warning": "No markdown content found"}).decode()
     except Exception as e:
         logger.error(f"Failed to scrape {url}: {str(e)}")
-        return json.dumps({"error": f"Scraping failed: {str(e)}"})
+        scraped = orjson.dumps({"error": f"Scraping failed: {str(e)}"}).decode()
+    _memo_put(memo_key, scraped, SCRAPE_CACHE_TTL_SECONDS)
+    _run_cache_store(canonical_url, host, scraped)
+    return scraped
+
+
+async def _gather_scrapes(urls: list[str]) -> list[str]:
+    """Scrapes all URLs concurrently over a single pooled session.
+
+    Args:
+        urls: The URLs to scrape.
+
+    Returns:
+        The scrape results, in the same order as the input URLs.
+    """
+    headers = {
+        "Authorization": f"Bearer {os.environ['FIRECRAWL_API_KEY']}",
+        "Content-Type": "application/json",
+    }
+    connector = aiohttp.TCPConnector(limit=10)
+    timeout = aiohttp.ClientTimeout(total=60)
+    async with aiohttp.ClientSession(
+        connector=connector, headers=headers, timeout=timeout
+    ) as session:
+        return await asyncio.gather(*[_scrape_one(session, url) for url in urls])
+
+
+def scrape_many(urls: list[str]) -> str:
+    """Scrape multiple webpages concurrently and return their markdown content.
+
+    Much faster than calling 'scrape' once per URL: all requests are issued
+    in parallel, so the total time is roughly that of the slowest single page.
+
+    Args:
+        urls: A list of URLs to scrape.
+
+    Returns:
+        A JSON string mapping each URL to its markdown content (or an error
+        message for that URL).
+    """
+    return asyncio.run(async_scrape_many(urls))
+
+
+async def async_scrape_many(urls: list[str]) -> str:
+    """Async variant of 'scrape_many' for use on a running event loop.
+
+    Args:
+        urls: A list of URLs to scrape.
+
+    Returns:
+        A JSON string mapping each URL to its markdown content (or an error
+        message for that URL).
+    """
+    logger.info("Scraping %d URLs concurrently: %s", len(urls), urls)
+    try:
+        results = await _gather_scrapes(urls)
+        return orjson.dumps(dict(zip(urls, results))).decode()
+    except Exception as e:
+        logger.error(f"Batch scrape failed: {str(e)}")
+        return orjson.dumps({"error": f"Batch scraping failed: {str(e)}"}).decode()
+
+
+async def async_search(query: str, num_results: int = 5) -> str:
+    """Async variant of 'search', run in a worker thread.
+
+    Keeps the blocking session and cache logic intact while not blocking
+    the event loop.
+
+    Args:
+        query: The search query string.
+        num_results: The number of search results to return (default 5).
+
+    Returns:
+        A JSON string containing the search results, or an error message.
+    """
+    return await asyncio.to_thread(search, query, num_results)
+
+
+async def async_scrape(url: str) -> str:
+    """Async variant of 'scrape', run in a worker thread.
+
+    Args:
+        url: The URL to scrape.
+
+    Returns:
+        The markdown content of the page, or an error message.
+    """
+    return await asyncio.to_thread(scrape, url)
 
 
 if __name__ == "__main__":
-    # Example usage (for testing)
+    # Example usage (for testing); when run directly there is no app.py to
+    # configure logging or load the environment for us.
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    dotenv.load_dotenv()
     test_query = "latest advancements in AI"
     print(f"--- Testing Search ---")
     search_results = search(test_query)
     print(f"Search results for '{test_query}':")
     try:
         # Pretty print the JSON if possible
-        print(json.dumps(json.loads(search_results), indent=2))
-    except json.JSONDecodeError:
+        print(
+            orjson.dumps(
+                orjson.loads(search_results), option=orjson.OPT_INDENT_2
+            ).decode()
+        )
+    except orjson.JSONDecodeError:
         print(search_results)  # Print raw string if not valid JSON
 
     print(f"\n--- Testing Scrape ---")
     # Find a URL from the search results to test scraping
     test_url = None
     try:
-        results_data = json.loads(search_results)
+        results_data = orjson.loads(search_results)
         if "organic" in results_data and len(results_data["organic"]) > 0:
             test_url = results_data["organic"][0].get("link")
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         pass  # Can't parse search results
 
     if test_url: